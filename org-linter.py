@@ -2,14 +2,39 @@
 """Org-linter: Scan and lint org-mode files for compliance issues."""
 
 import argparse
+import json
+import os
+import re
+import sqlite3
 import sys
+import threading
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
+from functools import partial
 from pathlib import Path
-from typing import Dict, List, Tuple, Set
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Set
 import orgparse
 import logging
 
 
+# Below this many files, starting worker processes costs more than it saves. The
+# byte scanner takes tens of microseconds per file, against milliseconds for orgparse
+# (--strict), so it needs far more files to make up for the pool start-up and pickling.
+PARALLEL_MIN_FILES = 512
+STRICT_PARALLEL_MIN_FILES = 32
+
+# Directory listing threads; beyond a few, kernel directory locks make more threads slower
+DEFAULT_WALK_JOBS = 4
+
+DEFAULT_CACHE_DIR = Path('~/.cache/org-linter')
+CACHE_FILENAME = 'parse-cache.sqlite3'
+# Bump whenever parse_org_file changes what it extracts, to invalidate old entries
+CACHE_VERSION = 6
+# Seconds to wait for another run holding the cache locked before going without it
+CACHE_BUSY_TIMEOUT = 1.0
+
+
 def setup_logging(debug: bool) -> None:
     """Configure logging for debug output."""
     level = logging.DEBUG if debug else logging.WARNING
@@ -20,202 +45,699 @@ def setup_logging(debug: bool) -> None:
     )
 
 
-def find_org_files(directories: List[Path], ignore_directories: List[Path] = None) -> List[Path]:
-    """Recursively find all .org files in given directories, following symlinks while avoiding cycles."""
-    if ignore_directories is None:
-        ignore_directories = []
+# Identifies a directory however it is reached, through symlinks or not
+DirectoryKey = Tuple[int, int]
+# A directory's .org files and its subdirectories paired with their keys
+DirectoryListing = Tuple[List[str], List[Tuple[str, DirectoryKey]]]
 
+
+def _directory_key(directory: str) -> Optional[DirectoryKey]:
+    """Get the (device, inode) pair of a directory, following symlinks; None if it can't be stat'ed."""
+    try:
+        st = os.stat(directory)
+    except OSError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _scan_directory(directory: str) -> DirectoryListing:
+    """List one directory, returning its .org files and its subdirectories paired with their keys."""
     org_files = []
-    visited = set()
+    subdirectories = []
+    try:
+        # scandir reports entry types from the directory listing, saving a stat per entry
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith('.org') and entry.is_file():
+                    org_files.append(entry.path)
+                elif entry.is_dir():
+                    # Symlinked directories are followed; one stat identifies the target. Not
+                    # entry.stat(), which leaves st_dev and st_ino zero on Windows.
+                    key = _directory_key(entry.path)
+                    if key is not None:
+                        subdirectories.append((entry.path, key))
+    except OSError:
+        # Skip directories we can't read
+        pass
+    return org_files, subdirectories
+
+
+def iter_org_files(
+    directories: List[Path],
+    ignore_directories: List[Path] = None,
+    jobs: int = DEFAULT_WALK_JOBS
+) -> Iterator[Path]:
+    """
+    Yield the .org files in given directories as they are found, following symlinks while avoiding cycles.
 
-    def _should_ignore_directory(directory: Path, ignore_dirs: List[Path]) -> bool:
-        """Check if a directory should be ignored based on resolved paths."""
-        try:
-            directory_resolved = directory.resolve()
-        except (OSError, RuntimeError):
-            return False
+    Directories are walked depth-first in listing order, one at a time, so callers can start
+    on the files before the walk ends. A directory reached by several paths is entered through
+    the first one in that order. Directories are listed ahead of the walk by a pool of jobs
+    threads (1 lists them in the calling thread), which does not change the result.
+    """
+    if ignore_directories is None:
+        ignore_directories = []
 
-        for ignore_dir in ignore_dirs:
-            try:
-                ignore_resolved = ignore_dir.resolve()
-                if directory_resolved == ignore_resolved:
-                    logging.debug(f"Ignoring directory: {directory} (resolved: {directory_resolved})")
-                    return True
-            except (OSError, RuntimeError):
+    # Directories are compared by device and inode, so symlinks match their targets both ways
+    ignored = {_directory_key(os.fspath(ignore_dir)) for ignore_dir in ignore_directories}
+    ignored.discard(None)
+    visited: Set[DirectoryKey] = set()
+    roots = [(os.fspath(directory), _directory_key(os.fspath(directory))) for directory in directories]
+
+    def _walk(start_listing: Callable[[str], Callable[[], DirectoryListing]]) -> Iterator[Path]:
+        """Walk with an explicit stack; start_listing starts listing a directory and returns a function waiting for it."""
+
+        def _pending(
+            candidates: Iterable[Tuple[str, Optional[DirectoryKey]]]
+        ) -> List[Tuple[str, DirectoryKey, Callable[[], DirectoryListing]]]:
+            """Start listing the candidates that are not ignored or visited, first candidate last for the stack."""
+            entries = []
+            for directory, key in candidates:
+                if key is None:
+                    # Roots that don't exist have nothing to scan
+                    continue
+                if key in ignored:
+                    logging.debug(f"Ignoring directory: {directory}")
+                elif key not in visited:
+                    entries.append((directory, key, start_listing(directory)))
+            return entries[::-1]
+
+        pending = _pending(roots)
+        while pending:
+            directory, key, listing = pending.pop()
+            # Directories are marked visited when entered, not when listed, so which path
+            # reaches a directory first does not depend on which listing finishes first
+            if key in visited:
                 continue
+            visited.add(key)
+            files, subdirectories = listing()
+            pending.extend(_pending(subdirectories))
+            yield from map(Path, files)
+
+    if jobs <= 1:
+        yield from _walk(lambda directory: partial(_scan_directory, directory))
+    else:
+        # Only this thread touches visited; the pool lists the directories still on the stack
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            yield from _walk(lambda directory: executor.submit(_scan_directory, directory).result)
+
+
+def find_org_files(
+    directories: List[Path],
+    ignore_directories: List[Path] = None,
+    jobs: int = DEFAULT_WALK_JOBS
+) -> List[Path]:
+    """
+    Recursively find all .org files in given directories, following symlinks while avoiding cycles.
 
-        return False
+    Returns the files of iter_org_files, sorted.
+    """
+    return sorted(iter_org_files(directories, ignore_directories, jobs))
 
-    def _find_recursive(directory: Path) -> None:
-        """Recursively traverse directory, following symlinks but avoiding infinite loops."""
-        # Check if directory should be ignored
-        if _should_ignore_directory(directory, ignore_directories):
-            return
 
-        try:
-            # Resolve to real path to detect cycles
-            real_path = directory.resolve()
-            if real_path in visited:
-                return
-            visited.add(real_path)
-        except (OSError, RuntimeError):
-            # Handle permission errors or broken symlinks
-            return
+# posix_fadvise is not available on macOS or Windows
+_HAS_FADVISE = hasattr(os, 'posix_fadvise')
 
+
+def _read_file(filepath: Path) -> bytes:
+    """Read a whole file, telling the kernel it is read once from start to end so it reads ahead."""
+    with open(filepath, 'rb', buffering=0) as f:
+        if _HAS_FADVISE:
+            # The hints are separate values, not flags, so each needs its own call.
+            # DONTNEED is not given afterwards, as it would evict pages the next run can reuse.
+            try:
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+            except OSError:
+                # Only hints; some filesystems reject them
+                pass
+        return f.read()
+
+
+def _prefetch_files(org_files: List[Path]) -> None:
+    """Ask the kernel to start reading every file now, so that the reads are queued together."""
+    for filepath in org_files:
+        try:
+            fd = os.open(filepath, os.O_RDONLY)
+        except OSError:
+            continue
         try:
-            # Find .org files in current directory
-            for item in directory.iterdir():
-                if item.name.endswith('.org') and item.is_file(follow_symlinks=True):
-                    org_files.append(item)
-                elif item.is_dir(follow_symlinks=True):
-                    # Recurse into subdirectories (follows symlinks)
-                    _find_recursive(item)
-        except (PermissionError, OSError):
-            # Skip directories we can't read
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
             pass
+        finally:
+            os.close(fd)
 
-    for directory in directories:
-        _find_recursive(directory)
 
-    return sorted(org_files)
+def _traverse_nodes(root):
+    """Traverse org nodes in document order, using an explicit stack instead of nested generators."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(reversed(node.children))
 
 
-def _traverse_nodes(node):
-    """Recursively traverse org nodes."""
-    yield node
-    for child in node.children:
-        yield from _traverse_nodes(child)
+def _line_start_offsets(raw: bytes) -> List[int]:
+    """Get the byte offset at which each line starts; entry i is for line i + 1."""
+    line_starts = [0]
+    append = line_starts.append
+    newline = raw.find(b'\n')
+    while newline != -1:
+        append(newline + 1)
+        newline = raw.find(b'\n', newline + 1)
+    return line_starts
 
 
-def _get_byte_offset_for_line(text_content: str, line_number: int) -> int:
+def _get_byte_offset_for_line(line_starts: List[int], line_number: int) -> int:
     """Get byte offset at the start of a given line number (1-indexed)."""
     if line_number <= 1:
         return 0
+    return line_starts[min(line_number, len(line_starts)) - 1]
+
+
+def _get_node_id(node) -> Tuple[Optional[str], str]:
+    """Get the org-id of a node, if any, and whether it is a file-level or heading ID."""
+    if node.is_root():
+        # For root node, try both file-level metadata and root PROPERTIES drawer
+        org_id = node.get_file_property('ID')  # #+ID: metadata
+        if not org_id:
+            org_id = node.properties.get('ID')  # :PROPERTIES: drawer at file start
+        return org_id, 'file-level'
+    # For heading nodes, use get_property to access PROPERTIES drawer ID
+    return node.get_property('ID'), 'heading'
+
+
+def _extract_with_orgparse(
+    raw: bytes,
+    filepath: str,
+    need_ids: bool,
+    need_tags: bool
+) -> Tuple[List[Tuple[str, int, str]], Set[str]]:
+    """Extract (id, byte_offset, id_type) triples and tags by building the full orgparse tree."""
+    # orgparse gets the text, offsets come from the raw bytes. Lines are split on
+    # '\n' only (unlike str.splitlines, which orgparse.loads uses) so that orgparse
+    # line numbers index the line start table.
+    text = raw.decode('utf-8', errors='ignore')
+    root = orgparse.loadi(text.split('\n'), filename=str(filepath))
+
+    found_ids = []
+    tags = set()
+    # Built on the first ID, since files without IDs never need it
+    line_starts: Optional[List[int]] = None
+
+    for node in _traverse_nodes(root):
+        # Extract org-ids from PROPERTIES drawer or file-level properties
+        org_id, id_type = _get_node_id(node) if need_ids else (None, '')
+
+        if org_id:
+            # Offset of the heading line, or of the start of the file for file-level IDs
+            if line_starts is None:
+                line_starts = _line_start_offsets(raw)
+            byte_offset = _get_byte_offset_for_line(line_starts, node.linenumber or 1)
+            found_ids.append((org_id, byte_offset, id_type))
+
+        # Extract tags from headings
+        if need_tags:
+            tags.update(node.tags)
+
+    return found_ids, tags
+
+
+# The fast scanner reads raw bytes and mirrors what orgparse extracts. Lines are
+# '\n'-terminated, and it jumps between candidate lines with bytes.find rather
+# than visiting every line. Tags are matched on the decoded heading, since tag
+# characters (\w) include non-ASCII letters. This finds the same tags as orgparse's
+# RE_HEADING_TAGS, (.*?)\s*:([\w@:]+):\s*$, without the leading lazy group, which
+# takes quadratic time on headings that contain colons but no tags.
+_HEADING_TAGS_RE = re.compile(r':([\w@:]+):\s*$')
+# ASCII characters that \s matches in a line
+_ASCII_LINE_SPACE = b' \t\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
+
+def _decode_value(value: bytes) -> str:
+    """Decode a keyword or property value the way orgparse would see it."""
+    return value.decode('utf-8', errors='ignore').strip()
+
+
+def _is_blank(prefix: bytes) -> bool:
+    """Check that prefix is only whitespace to orgparse, which includes Unicode whitespace."""
+    rest = prefix.strip(_ASCII_LINE_SPACE)
+    # Only decode when non-ASCII bytes are left, which may be Unicode whitespace (or dropped as undecodable)
+    return not rest or (not rest.isascii() and not _decode_value(rest))
+
+
+def _heading_starts(raw: bytes) -> List[int]:
+    """Get the offsets of the heading lines: one or more stars followed by a space (orgparse's RE_NODE_HEADER)."""
+    starts = []
+    if raw.startswith(b'*'):
+        line = 0
+    else:
+        line = raw.find(b'\n*') + 1
+        if not line:
+            return starts
+    while True:
+        stars_end = line + 1
+        while raw.startswith(b'*', stars_end):
+            stars_end += 1
+        if raw.startswith(b' ', stars_end):
+            starts.append(line)
+        line = raw.find(b'\n*', stars_end - 1) + 1
+        if not line:
+            return starts
+
+
+def _keyword_values(raw: bytes, end: int) -> Dict[bytes, List[bytes]]:
+    """Get the values of the "#+KEYWORD:" lines in raw[:end], by upper-cased keyword."""
+    # Collected in one pass, as files are usually small enough that a second pass for
+    # another keyword costs as much as the rest of the scan
+    values: Dict[bytes, List[bytes]] = {}
+    pos = raw.find(b'#+', 0, end)
+    while pos >= 0:
+        line_start = raw.rfind(b'\n', 0, pos) + 1
+        line_end = raw.find(b'\n', pos, end)
+        if line_end < 0:
+            line_end = end
+        # Only whitespace may come before the keyword
+        if _is_blank(raw[line_start:pos]):
+            key, sep, value = raw[pos + 2:line_end].partition(b':')
+            if sep:
+                values.setdefault(key.upper(), []).append(value)
+        pos = raw.find(b'#+', line_end, end)
+    return values
+
+
+def _drawer_id(raw: bytes, start: int, end: int) -> str:
+    """Get the ID from the first property drawer in raw[start:end], or '' if there is none."""
+    # Like orgparse, only the first drawer counts, and it runs up to the line containing :END:
+    drawer = raw.find(b':PROPERTIES:', start, end)
+    if drawer < 0:
+        return ''
+    drawer_start = raw.find(b'\n', drawer, end) + 1
+    if not drawer_start:
+        return ''
+    drawer_end = raw.find(b':END:', drawer_start, end)
+    if drawer_end < 0:
+        drawer_end = end
+    else:
+        drawer_end = max(drawer_start, raw.rfind(b'\n', drawer_start, drawer_end) + 1)
+
+    # A repeated property overrides the earlier ones, so search backwards for
+    # an :ID: with only whitespace before it on its line
+    pos = raw.rfind(b':ID:', drawer_start, drawer_end)
+    while pos >= 0:
+        line_start = max(drawer_start, raw.rfind(b'\n', drawer_start, pos) + 1)
+        if _is_blank(raw[line_start:pos]):
+            line_end = raw.find(b'\n', pos, drawer_end)
+            return _decode_value(raw[pos + 4:line_end if line_end >= 0 else drawer_end])
+        pos = raw.rfind(b':ID:', drawer_start, pos)
+    return ''
+
+
+def _scan_org_bytes(
+    raw: bytes,
+    need_ids: bool,
+    need_tags: bool
+) -> Tuple[List[Tuple[str, int, str]], Set[str]]:
+    """Extract (id, byte_offset, id_type) triples and tags by scanning the raw bytes."""
+    heading_starts = _heading_starts(raw)
+    # Lines before the first heading belong to the file itself
+    root_end = heading_starts[0] if heading_starts else len(raw)
+
+    keywords = _keyword_values(raw, root_end)
+
+    found_ids = []
+    if need_ids:
+        file_ids = keywords.get(b'ID', [])
+        if len(file_ids) > 1:
+            raise ValueError(f"Multiple values for property ID: {[_decode_value(v) for v in file_ids]}")
+        # Every drawer ID needs a literal ':ID:', so files without one skip the drawer search
+        has_drawer_ids = b':ID:' in raw
+        org_id = _decode_value(file_ids[0]) if file_ids else ''
+        if not org_id and has_drawer_ids:
+            org_id = _drawer_id(raw, 0, root_end)
+        if org_id:
+            found_ids.append((org_id, 0, 'file-level'))
+
+        if has_drawer_ids:
+            for start, end in zip(heading_starts, heading_starts[1:] + [len(raw)]):
+                # The drawer is searched in the body, after the heading line
+                body_start = raw.find(b'\n', start, end) + 1
+                org_id = _drawer_id(raw, body_start, end) if body_start else ''
+                if org_id:
+                    found_ids.append((org_id, start, 'heading'))
+
+    tags = set()
+    if need_tags:
+        for value in keywords.get(b'FILETAGS', []):
+            tags.update(tag.strip() for tag in _decode_value(value).split(':') if tag.strip())
+        for start in heading_starts:
+            end = raw.find(b'\n', start)
+            line = raw[start:end] if end >= 0 else raw[start:]
+            # Tags end the heading, so only decode headings ending in ':' or in a
+            # non-ASCII character, which may be Unicode whitespace after the tags
+            tail = line.rstrip(_ASCII_LINE_SPACE)[-1:]
+            if tail == b':' or tail >= b'\x80':
+                match = _HEADING_TAGS_RE.search(line.decode('utf-8', errors='ignore'))
+                if match:
+                    tags.update(match.group(1).split(':'))
+
+    return found_ids, tags
+
+
+# Per-file result without paths, cheap to send back from worker processes and to cache:
+# ({id: [byte_offset, ...]}, tags)
+FileResult = Tuple[Dict[str, List[int]], Set[str]]
+
+
+def _extract_from_file(
+    filepath: str,
+    need_ids: bool = True,
+    need_tags: bool = True,
+    strict: bool = False
+) -> FileResult:
+    """Extract the byte offsets of each org-id and the tags of one file, as for parse_org_file."""
+    if not (need_ids or need_tags):
+        return {}, set()
+
+    try:
+        raw = _read_file(filepath)
+        if strict:
+            found_ids, tags = _extract_with_orgparse(raw, filepath, need_ids, need_tags)
+        else:
+            found_ids, tags = _scan_org_bytes(raw, need_ids, need_tags)
+    except Exception as e:
+        logging.warning(f"Failed to parse {filepath}: {e}")
+        return {}, set()
 
-    lines = text_content.split('\n')
-    byte_offset = 0
-    for i in range(min(line_number - 1, len(lines))):
-        byte_offset += len(lines[i].encode('utf-8')) + 1  # +1 for newline
-    return byte_offset
+    offsets: Dict[str, List[int]] = defaultdict(list)
+    for org_id, byte_offset, id_type in found_ids:
+        offsets[org_id].append(byte_offset)
+        logging.debug(f"  Extracted {id_type} ID '{org_id}' at byte offset {byte_offset}")
 
+    # Hand back a plain dict so lookups of missing IDs do not insert entries
+    return dict(offsets), tags
 
-def parse_org_file(filepath: Path) -> Tuple[Dict[str, List[Tuple[int, Path]]], Set[str]]:
+
+def parse_org_file(
+    filepath: Path,
+    need_ids: bool = True,
+    need_tags: bool = True,
+    strict: bool = False
+) -> Tuple[Dict[str, List[Tuple[int, Path]]], Set[str]]:
     """
     Parse an org file and extract org-ids and tags.
 
+    need_ids and need_tags skip extracting what the caller will not use.
+    By default the raw bytes are scanned with regular expressions; strict
+    builds the full orgparse tree instead, which is several times slower.
+
     Returns:
         Tuple of (org_ids_dict, tags_set) where:
         - org_ids_dict: {id: [(byte_offset, filepath), ...]}
         - tags_set: set of tags in this file
     """
+    offsets, tags = _extract_from_file(os.fspath(filepath), need_ids, need_tags, strict)
+    org_ids = {
+        org_id: [(byte_offset, filepath) for byte_offset in id_offsets]
+        for org_id, id_offsets in offsets.items()
+    }
+    return org_ids, tags
+
+
+def _parse_chunksize(num_files: int, workers: int) -> int:
+    """Size parser batches so each worker receives about four of them."""
+    return max(1, num_files // (workers * 4))
+
+
+# Parses one file given as a string path; a picklable partial of _extract_from_file
+# so it can run in worker processes
+FileParser = Callable[[str], FileResult]
+
+
+def _parse_files(
+    org_files: List[Path],
+    jobs: Optional[int],
+    parse: FileParser,
+    prefetch: bool = False,
+    min_parallel: int = PARALLEL_MIN_FILES
+) -> Iterator[FileResult]:
+    """
+    Parse files in order, fanning out to a process pool once there are min_parallel of them.
+
+    With prefetch, a background thread asks the kernel to read all the files
+    ahead of the parsers, so that a cold cache sees many reads in flight at once.
+    """
+    prefetcher = None
+    if prefetch and _HAS_FADVISE and len(org_files) > 1:
+        prefetcher = threading.Thread(target=_prefetch_files, args=(org_files,), daemon=True)
+        prefetcher.start()
+
     try:
-        root = orgparse.load(str(filepath))
-    except Exception as e:
-        logging.warning(f"Failed to parse {filepath}: {e}")
-        return {}, set()
+        # Plain strings are cheaper than Path objects to pickle for the workers
+        paths = [os.fspath(filepath) for filepath in org_files]
+        workers = jobs or os.cpu_count() or 1
+        if workers <= 1 or len(paths) < min_parallel:
+            yield from map(parse, paths)
+            return
 
-    org_ids = {}
-    tags = set()
+        logging.debug(f"Parsing with {workers} worker processes")
+        debug = logging.getLogger().isEnabledFor(logging.DEBUG)
+        with ProcessPoolExecutor(max_workers=workers, initializer=setup_logging, initargs=(debug,)) as executor:
+            yield from executor.map(parse, paths, chunksize=_parse_chunksize(len(paths), workers))
+    finally:
+        if prefetcher is not None:
+            prefetcher.join()
 
-    # Read file to get byte positions
-    with open(filepath, 'rb') as f:
-        content = f.read()
 
-    text_content = content.decode('utf-8', errors='ignore')
+def open_parse_cache(cache_dir: Path) -> Optional[sqlite3.Connection]:
+    """Open the parse cache in cache_dir, creating it if needed; None if it cannot be used."""
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        cache = sqlite3.connect(str(cache_dir / CACHE_FILENAME), timeout=CACHE_BUSY_TIMEOUT)
+        # With write-ahead logging, runs reading the cache don't block a run storing into it
+        cache.execute('PRAGMA journal_mode=WAL')
+        (version,) = cache.execute('PRAGMA user_version').fetchone()
+        if version != CACHE_VERSION:
+            logging.debug(f"Resetting parse cache (version {version}, expected {CACHE_VERSION})")
+            with cache:
+                cache.execute('DROP TABLE IF EXISTS parsed')
+                cache.execute(f'PRAGMA user_version = {CACHE_VERSION}')
+        with cache:
+            cache.execute(
+                'CREATE TABLE IF NOT EXISTS parsed ('
+                'path TEXT NOT NULL, variant TEXT NOT NULL, mtime_ns INTEGER NOT NULL, size INTEGER NOT NULL, '
+                'result TEXT NOT NULL, PRIMARY KEY (path, variant))'
+            )
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Parse cache disabled: {e}")
+        return None
+    logging.debug(f"Using parse cache in {cache_dir}")
+    return cache
+
+
+def _cache_variant(need_ids: bool, need_tags: bool, strict: bool) -> str:
+    """Name the kind of parse result stored, since results without IDs or tags can't be reused for both."""
+    return '+'.join(name for name, needed in (('ids', need_ids), ('tags', need_tags), ('strict', strict)) if needed)
+
+
+def _cache_key(filepath: Path, variant: str) -> Optional[Tuple[str, str, int, int]]:
+    """Get the (path, variant, mtime_ns, size) key identifying the current contents of a file."""
+    try:
+        st = os.stat(filepath)
+    except OSError:
+        return None
+    return os.path.abspath(filepath), variant, st.st_mtime_ns, st.st_size
+
+
+def _cache_lookup(
+    cache: sqlite3.Connection,
+    key: Optional[Tuple[str, str, int, int]]
+) -> Optional[FileResult]:
+    """Return the cached parse result for the file identified by key if it is unchanged since it was stored."""
+    if key is None:
+        return None
+    row = cache.execute(
+        'SELECT result FROM parsed WHERE path = ? AND variant = ? AND mtime_ns = ? AND size = ?',
+        key
+    ).fetchone()
+    if row is None:
+        return None
+    offsets, tags = json.loads(row[0])
+    return offsets, set(tags)
+
+
+def _cache_store(
+    cache: sqlite3.Connection,
+    key: Optional[Tuple[str, str, int, int]],
+    result: FileResult
+) -> None:
+    """Store a parse result under key; results carry no file paths, so they can be reused for any path spelling."""
+    if key is None:
+        return
+    offsets, tags = result
+    cache.execute(
+        'INSERT OR REPLACE INTO parsed (path, variant, mtime_ns, size, result) VALUES (?, ?, ?, ?, ?)',
+        key + (json.dumps([offsets, sorted(tags)]),)
+    )
 
-    for node in _traverse_nodes(root):
-        # Extract org-ids from PROPERTIES drawer or file-level properties
-        if node.is_root():
-            # For root node, try both file-level metadata and root PROPERTIES drawer
-            org_id = node.get_file_property('ID')  # #+ID: metadata
-            if not org_id:
-                org_id = node.properties.get('ID')  # :PROPERTIES: drawer at file start
-            id_type = 'file-level'
-        else:
-            # For heading nodes, use get_property to access PROPERTIES drawer ID
-            org_id = node.get_property('ID')
-            id_type = 'heading'
 
-        if org_id:
-            # Get byte offset of the header/heading location (not the ID property)
-            if node.is_root():
-                # For file-level IDs, find the :PROPERTIES: line at start of file
-                # or use line 1 if it starts with #+ID:
-                byte_offset = _get_byte_offset_for_line(text_content, node.linenumber or 1)
-            else:
-                # For heading IDs, use the heading's line number
-                byte_offset = _get_byte_offset_for_line(text_content, node.linenumber or 1)
-
-            if byte_offset >= 0:
-                if org_id not in org_ids:
-                    org_ids[org_id] = []
-                org_ids[org_id].append((byte_offset, filepath))
-                logging.debug(f"  Extracted {id_type} ID '{org_id}' at byte offset {byte_offset}")
+def _parse_files_cached(
+    org_files: List[Path],
+    jobs: Optional[int],
+    parse: FileParser,
+    cache: sqlite3.Connection,
+    variant: str,
+    prefetch: bool = False,
+    min_parallel: int = PARALLEL_MIN_FILES
+) -> List[FileResult]:
+    """Parse files in order, reusing cached results and parsing only new or changed files.
+
+    Cache errors, such as another run holding it locked, are logged and the files parsed as if uncached.
+    """
+    keys = [_cache_key(filepath, variant) for filepath in org_files]
+    try:
+        cached = [_cache_lookup(cache, key) for key in keys]
+    except sqlite3.Error as e:
+        logging.warning(f"Parse cache unavailable, parsing all files: {e}")
+        cached = [None] * len(org_files)
+    misses = [(filepath, key) for filepath, key, hit in zip(org_files, keys, cached) if hit is None]
+    logging.debug(f"Parse cache: {len(org_files) - len(misses)} hits, {len(misses)} misses")
+
+    fresh = list(_parse_files([filepath for filepath, _ in misses], jobs, parse, prefetch, min_parallel))
+    try:
+        with cache:
+            for (_, key), result in zip(misses, fresh):
+                _cache_store(cache, key, result)
+    except sqlite3.Error as e:
+        logging.warning(f"Parse cache not updated: {e}")
 
-        # Extract tags from headings
-        node_tags = node.tags
-        if node_tags:
-            tags.update(node_tags)
+    fresh_results = iter(fresh)
+    return [hit if hit is not None else next(fresh_results) for hit in cached]
 
-    return org_ids, tags
 
+def _collect_org_ids(
+    org_files: List[Path],
+    jobs: Optional[int],
+    cache: Optional[sqlite3.Connection],
+    need_ids: bool,
+    need_tags: bool,
+    strict: bool,
+    prefetch: bool
+) -> Tuple[Dict[str, Tuple[int, Path]], Dict[str, List[Tuple[int, Path]]], Dict[str, List[Path]]]:
+    """
+    Aggregate like aggregate_org_ids, keeping IDs seen once apart from repeated ones.
+
+    Returns:
+        Tuple of (seen_once, duplicates, tag_files) where:
+        - seen_once: {id: (byte_offset, filepath)}
+        - duplicates: {id: [(byte_offset, filepath), ...]} for IDs found more than once
+        - tag_files: {tag: [filepath, ...]}
+    """
+    # IDs seen once keep a bare location; only repeated IDs get a list
+    seen_once: Dict[str, Tuple[int, Path]] = {}
+    duplicates: Dict[str, List[Tuple[int, Path]]] = {}
+    # Tags are unique within a file's result and each file is merged once, so lists need no dedup
+    tag_files: Dict[str, List[Path]] = defaultdict(list)
+
+    parse = partial(_extract_from_file, need_ids=need_ids, need_tags=need_tags, strict=strict)
+    min_parallel = STRICT_PARALLEL_MIN_FILES if strict else PARALLEL_MIN_FILES
+    if cache is None:
+        results = _parse_files(org_files, jobs, parse, prefetch, min_parallel)
+    else:
+        variant = _cache_variant(need_ids, need_tags, strict)
+        results = _parse_files_cached(org_files, jobs, parse, cache, variant, prefetch, min_parallel)
+    for filepath, (offsets, tags) in zip(org_files, results):
+        logging.debug(f"Parsed {filepath}")
+
+        # Merge org-ids. Results from worker processes carry their own copies of the
+        # strings, so intern the IDs; every location shares the caller's filepath.
+        for org_id, id_offsets in offsets.items():
+            org_id = sys.intern(org_id)
+            for byte_offset in id_offsets:
+                location = (byte_offset, filepath)
+                if org_id in duplicates:
+                    duplicates[org_id].append(location)
+                elif org_id in seen_once:
+                    duplicates[org_id] = [seen_once.pop(org_id), location]
+                else:
+                    seen_once[org_id] = location
+
+        # Track which files have which tags
+        for tag in tags:
+            tag_files[sys.intern(tag)].append(filepath)
+
+    return seen_once, duplicates, dict(tag_files)
 
-def aggregate_org_ids(org_files: List[Path]) -> Tuple[Dict[str, List[Tuple[int, Path]]], Dict[str, Set[Path]]]:
+
+def aggregate_org_ids(
+    org_files: List[Path],
+    jobs: Optional[int] = None,
+    cache: Optional[sqlite3.Connection] = None,
+    need_ids: bool = True,
+    need_tags: bool = True,
+    strict: bool = False,
+    prefetch: bool = False
+) -> Tuple[Dict[str, List[Tuple[int, Path]]], Dict[str, List[Path]]]:
     """
     Aggregate org-ids and tags from all files.
 
+    Files are parsed in a process pool once there are PARALLEL_MIN_FILES of them
+    (STRICT_PARALLEL_MIN_FILES with strict); jobs caps the number of worker
+    processes (default: CPU count, 1 disables).
+    When a cache from open_parse_cache() is given, only new or changed files are parsed.
+    need_ids, need_tags and strict are as for parse_org_file. With prefetch,
+    the files still to be parsed are read ahead in the background.
+
     Returns:
         Tuple of (all_org_ids, tag_files) where:
         - all_org_ids: {id: [(byte_offset, filepath), ...]}
-        - tag_files: {tag: set(filepaths)}
+        - tag_files: {tag: [filepath, ...]}
     """
-    all_org_ids: Dict[str, List[Tuple[int, Path]]] = {}
-    tag_files: Dict[str, Set[Path]] = {}
-
-    for filepath in org_files:
-        logging.debug(f"Parsing {filepath}")
-        org_ids, tags = parse_org_file(filepath)
+    seen_once, duplicates, tag_files = _collect_org_ids(
+        org_files, jobs, cache, need_ids, need_tags, strict, prefetch
+    )
+    all_org_ids = {org_id: [location] for org_id, location in seen_once.items()}
+    all_org_ids.update(duplicates)
+    return all_org_ids, tag_files
 
-        # Merge org-ids
-        for org_id, locations in org_ids.items():
-            if org_id not in all_org_ids:
-                all_org_ids[org_id] = []
-            all_org_ids[org_id].extend(locations)
 
-        # Track which files have which tags
-        for tag in tags:
-            if tag not in tag_files:
-                tag_files[tag] = set()
-            tag_files[tag].add(filepath)
+def _iter_org_table_lines(headers: List[str], rows: List[List[str]]) -> Iterator[str]:
+    """
+    Yield the lines of an org-mode table, without newlines.
 
-    return all_org_ids, tag_files
+    Rows shorter than headers are padded with empty cells; longer rows raise ValueError.
+    """
+    # Convert every cell to a string once, then size each column in a single pass
+    str_rows = []
+    for row in rows:
+        cells = [cell if isinstance(cell, str) else str(cell) for cell in row]
+        if len(cells) > len(headers):
+            raise ValueError(f"Table row has {len(cells)} cells but there are {len(headers)} headers: {cells}")
+        cells.extend([''] * (len(headers) - len(cells)))
+        str_rows.append(cells)
+    col_widths = [
+        max([len(header)] + [len(row[i]) for row in str_rows])
+        for i, header in enumerate(headers)
+    ]
 
+    # Build the padded row template once, so each row is a single format call
+    row_format = '| ' + ' | '.join(f'{{:<{width}}}' for width in col_widths) + ' |'
 
-def format_org_table(headers: List[str], rows: List[List[str]]) -> str:
-    """Format data as an org-mode table."""
-    # Calculate column widths
-    col_widths = [len(h) for h in headers]
-    for row in rows:
-        for i, cell in enumerate(row):
-            col_widths[i] = max(col_widths[i], len(str(cell)))
+    def _format_row(cells: List[str]) -> str:
+        return row_format.format(*cells)
 
-    # Format header
     separator = '| ' + ' | '.join('-' * (w + 2) for w in col_widths) + ' |'
-    header_row = '| ' + ' | '.join(
-        h.ljust(col_widths[i]) for i, h in enumerate(headers)
-    ) + ' |'
+    yield separator
+    yield _format_row(headers)
+    yield separator
+    yield from map(_format_row, str_rows)
+    yield separator
 
-    # Format data rows
-    data_rows = []
-    for row in rows:
-        formatted_cells = [
-            str(cell).ljust(col_widths[i])
-            for i, cell in enumerate(row)
-        ]
-        data_rows.append('| ' + ' | '.join(formatted_cells) + ' |')
 
-    table = '\n'.join([separator, header_row, separator] + data_rows + [separator])
-    return table
+def format_org_table(headers: List[str], rows: List[List[str]]) -> str:
+    """Format data as an org-mode table; rows may be shorter than headers, but not longer."""
+    return '\n'.join(_iter_org_table_lines(headers, rows))
 
 
 def get_timestamp() -> str:
@@ -223,134 +745,175 @@ def get_timestamp() -> str:
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
 
-def generate_duplicate_ids_section(all_org_ids: Dict[str, List[Tuple[int, Path]]], base_directories: List[Path]) -> str:
-    """Generate org-mode section for duplicate org-ids."""
-    # Filter to only duplicates
-    duplicates = {
+def _base_directory_prefix(base_dir: Path) -> str:
+    """Get the string that the paths of files under base_dir start with ('' for the current directory)."""
+    base = str(base_dir)
+    return '' if base == '.' else os.path.join(base, '')
+
+
+def _relative_display_path(filepath: Path, base_prefixes: List[str]) -> str:
+    """
+    Get filepath relative to the first base directory containing it, or just its name.
+
+    Paths are compared as given rather than resolved, which preserves symlink
+    directory names in the display.
+    """
+    path_str = str(filepath)
+    for prefix in base_prefixes:
+        # The current directory ('') only contains relative paths
+        if path_str.startswith(prefix) and (prefix or not os.path.isabs(path_str)):
+            return path_str[len(prefix):]
+    return filepath.name
+
+
+def _iter_section(title: str, headers: List[str], rows: List[List[str]]) -> Iterator[str]:
+    """Yield the lines of an org-mode section holding a table; nothing when there are no rows."""
+    if not rows:
+        return
+
+    yield f"* {title}\n"
+    yield ":PROPERTIES:\n"
+    yield f":CREATED:  {get_timestamp()}\n"
+    yield ":END:\n"
+    yield "\n"
+    for line in _iter_org_table_lines(headers, rows):
+        yield line + "\n"
+
+
+# Table with: id | No. Files | No. Instances | files (one row per id)
+DUPLICATE_IDS_HEADERS = ['id', 'No. Files', 'No. Instances', 'files']
+
+
+def _find_duplicate_ids(all_org_ids: Dict[str, List[Tuple[int, Path]]]) -> Dict[str, List[Tuple[int, Path]]]:
+    """Get the IDs that occur more than once, with their locations."""
+    return {
         org_id: locations
         for org_id, locations in all_org_ids.items()
         if len(locations) > 1
     }
 
-    if not duplicates:
-        return ""
 
-    # Build table with: id | No. Files | No. Instances | files (one row per id)
-    headers = ['id', 'No. Files', 'No. Instances', 'files']
+def _duplicate_ids_rows(duplicates: Dict[str, List[Tuple[int, Path]]], base_directories: List[Path]) -> List[List[str]]:
+    """Build the duplicate IDs table rows from _find_duplicate_ids(), sorted by ID."""
     rows = []
+    base_prefixes = [_base_directory_prefix(base_dir) for base_dir in base_directories]
+    # Files hold many IDs, so each display path is worked out once per report
+    rel_cache: Dict[Path, str] = {}
 
-    for org_id in sorted(duplicates.keys()):
-        locations = duplicates[org_id]
+    # IDs are unique, so sorting the items compares only the IDs
+    for org_id, locations in sorted(duplicates.items()):
         # Count unique files
         unique_files = len(set(filepath for _, filepath in locations))
         # Count total instances
         total_instances = len(locations)
 
         # Format each occurrence separately: [[file:<filepath>::<offset>][<relative-path>::<offset>]]
+        # Sort by path then offset, converting each path to a string once rather than through a key function
+        decorated = [(str(filepath), byte_offset, filepath) for byte_offset, filepath in locations]
+        decorated.sort()
         file_list = []
-        for byte_offset, filepath in sorted(locations, key=lambda x: (str(x[1]), x[0])):
-            # Find which base directory this file is under and calculate relative path
-            rel_path_str = filepath.name  # Default to filename only
-
-            for base_dir in base_directories:
-                try:
-                    # Use original (non-resolved) paths for relative_to comparison
-                    # This preserves symlink directory names in the display
-                    rel_path = filepath.relative_to(base_dir)
-                    rel_path_str = str(rel_path)
-                    break
-                except ValueError:
-                    # Not relative to this base_dir
-                    continue
-
-            file_list.append(f"[[file:{filepath}::{byte_offset}][{rel_path_str}::{byte_offset}]]")
+        for path_str, byte_offset, filepath in decorated:
+            rel_path_str = rel_cache.get(filepath)
+            if rel_path_str is None:
+                rel_path_str = rel_cache[filepath] = _relative_display_path(filepath, base_prefixes)
+            file_list.append(f"[[file:{path_str}::{byte_offset}][{rel_path_str}::{byte_offset}]]")
 
         files_str = ', '.join(file_list)
         rows.append([org_id, str(unique_files), str(total_instances), files_str])
 
-    table = format_org_table(headers, rows)
-    timestamp = get_timestamp()
+    return rows
 
-    section = f"""* Repeated IDs
-:PROPERTIES:
-:CREATED:  {timestamp}
-:END:
-
-{table}
-"""
-    return section
 
+def generate_duplicate_ids_section(all_org_ids: Dict[str, List[Tuple[int, Path]]], base_directories: List[Path]) -> str:
+    """Generate org-mode section for duplicate org-ids."""
+    rows = _duplicate_ids_rows(_find_duplicate_ids(all_org_ids), base_directories)
+    return ''.join(_iter_section('Repeated IDs', DUPLICATE_IDS_HEADERS, rows))
 
-def generate_tags_summary_section(tag_files: Dict[str, Set[Path]]) -> str:
-    """Generate org-mode section for tags summary."""
-    if not tag_files:
-        return ""
 
-    # Filter to only tags that appear in multiple files
-    repeated_tags = {
-        tag: files
-        for tag, files in tag_files.items()
-        if len(files) > 1
-    }
+TAGS_SUMMARY_HEADERS = ['tag', 'No. Files']
 
-    if not repeated_tags:
-        return ""
 
-    headers = ['tag', 'No. Files']
-    rows = [
+def _tags_summary_rows(tag_files: Dict[str, List[Path]]) -> List[List[str]]:
+    """Build the tags summary rows for tags that appear in multiple files, sorted by tag."""
+    return [
         [tag, str(len(files))]
-        for tag, files in sorted(repeated_tags.items())
+        for tag, files in sorted(tag_files.items())
+        if len(files) > 1
     ]
 
-    table = format_org_table(headers, rows)
-    timestamp = get_timestamp()
-
-    section = f"""* Tags summary
-:PROPERTIES:
-:CREATED:  {timestamp}
-:END:
 
-{table}
-"""
-    return section
+def generate_tags_summary_section(tag_files: Dict[str, List[Path]]) -> str:
+    """Generate org-mode section for tags summary."""
+    return ''.join(_iter_section('Tags summary', TAGS_SUMMARY_HEADERS, _tags_summary_rows(tag_files)))
 
 
-def generate_output(
+def _iter_report(
     org_files: List[Path],
-    all_org_ids: Dict[str, List[Tuple[int, Path]]],
-    tag_files: Dict[str, Set[Path]],
+    total_ids: int,
+    duplicates: Dict[str, List[Tuple[int, Path]]],
+    tag_files: Dict[str, List[Path]],
     enable_features: Dict[str, bool],
-    base_directories: List[Path] = None
-) -> str:
-    """Generate final org-mode output."""
+    base_directories: Optional[List[Path]]
+) -> Iterator[str]:
+    """Yield the report for iter_output, given only the ID count and the repeated IDs."""
     if base_directories is None:
         base_directories = []
 
-    lines = []
-    lines.append(f"#+TITLE: Org-linter Results")
-    lines.append(f"#+DATE: {get_timestamp()}")
-    lines.append(f"")
-    lines.append(f"Files scanned: {len(org_files)}")
-
-    # Calculate ID statistics
-    total_ids = len(all_org_ids)
-    duplicate_ids = sum(1 for locations in all_org_ids.values() if len(locations) > 1)
-
-    lines.append(f"IDs found: {total_ids}")
-    lines.append(f"Duplicate IDs: {duplicate_ids}")
-    lines.append(f"")
+    yield "#+TITLE: Org-linter Results\n"
+    yield f"#+DATE: {get_timestamp()}\n"
+    yield "\n"
+    yield f"Files scanned: {len(org_files)}\n"
+    yield f"IDs found: {total_ids}\n"
+    yield f"Duplicate IDs: {len(duplicates)}\n"
+    yield "\n"
 
+    # Each section is followed by a blank line
     if enable_features.get('duplicate-ids', False):
-        dup_section = generate_duplicate_ids_section(all_org_ids, base_directories)
-        if dup_section:
-            lines.append(dup_section)
+        rows = _duplicate_ids_rows(duplicates, base_directories)
+        if rows:
+            yield from _iter_section('Repeated IDs', DUPLICATE_IDS_HEADERS, rows)
+            yield "\n"
 
     if enable_features.get('tags-summary', False):
-        tags_section = generate_tags_summary_section(tag_files)
-        if tags_section:
-            lines.append(tags_section)
+        rows = _tags_summary_rows(tag_files)
+        if rows:
+            yield from _iter_section('Tags summary', TAGS_SUMMARY_HEADERS, rows)
+            yield "\n"
+
 
-    return '\n'.join(lines)
+def iter_output(
+    org_files: List[Path],
+    all_org_ids: Dict[str, List[Tuple[int, Path]]],
+    tag_files: Dict[str, List[Path]],
+    enable_features: Dict[str, bool],
+    base_directories: List[Path] = None
+) -> Iterator[str]:
+    """Yield the final org-mode output in newline-terminated chunks, so it can be written as it is produced."""
+    # The duplicates are found once, for both the count and the section
+    duplicates = _find_duplicate_ids(all_org_ids)
+    yield from _iter_report(org_files, len(all_org_ids), duplicates, tag_files, enable_features, base_directories)
+
+
+def generate_output(
+    org_files: List[Path],
+    all_org_ids: Dict[str, List[Tuple[int, Path]]],
+    tag_files: Dict[str, List[Path]],
+    enable_features: Dict[str, bool],
+    base_directories: List[Path] = None
+) -> str:
+    """Generate final org-mode output."""
+    return ''.join(iter_output(org_files, all_org_ids, tag_files, enable_features, base_directories))
+
+
+def _positive_int(value: str) -> int:
+    """Argparse type for counts that must be at least one."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid integer: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1: {number}")
+    return number
 
 
 def parse_arguments() -> argparse.Namespace:
@@ -380,6 +943,48 @@ def parse_arguments() -> argparse.Namespace:
         help='Enable tags summary generation'
     )
 
+    parser.add_argument(
+        '--jobs',
+        type=_positive_int,
+        default=None,
+        help='Number of parser processes (default: number of CPUs; 1 disables parallel parsing)'
+    )
+
+    parser.add_argument(
+        '--walk-jobs',
+        type=_positive_int,
+        default=DEFAULT_WALK_JOBS,
+        dest='walk_jobs',
+        help=f'Number of threads listing directories (default: {DEFAULT_WALK_JOBS})'
+    )
+
+    parser.add_argument(
+        '--cache-dir',
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        dest='cache_dir',
+        help=f'Directory holding the parse cache (default: {DEFAULT_CACHE_DIR})'
+    )
+
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        dest='no_cache',
+        help='Parse every file instead of reusing results cached from earlier runs'
+    )
+
+    parser.add_argument(
+        '--prefetch',
+        action='store_true',
+        help='Have the kernel read all files ahead of parsing (helps when they are not cached in memory; Linux only)'
+    )
+
+    parser.add_argument(
+        '--strict',
+        action='store_true',
+        help='Parse files with orgparse instead of the faster built-in scanner'
+    )
+
     parser.add_argument(
         '--ignore-directory',
         action='append',
@@ -419,14 +1024,24 @@ def main() -> None:
         logging.debug(f"Ignoring directories: {ignore_dirs}")
 
     # Find and parse org files
-    org_files = find_org_files(args.directories, ignore_dirs)
+    org_files = find_org_files(args.directories, ignore_dirs, args.walk_jobs)
     logging.debug(f"Found {len(org_files)} org files")
 
     if not org_files:
         logging.warning("No .org files found in specified directories")
 
     # Aggregate data
-    all_org_ids, tag_files = aggregate_org_ids(org_files)
+    cache = None if args.no_cache else open_parse_cache(args.cache_dir.expanduser())
+    try:
+        # IDs are always counted in the report header; tags are only needed for their summary.
+        # IDs found once are only counted, so they never get a location list.
+        seen_once, duplicates, tag_files = _collect_org_ids(
+            org_files, args.jobs, cache, need_ids=True, need_tags=args.enable_tags_summary,
+            strict=args.strict, prefetch=args.prefetch
+        )
+    finally:
+        if cache is not None:
+            cache.close()
 
     # Prepare enabled features
     enable_features = {
@@ -435,8 +1050,9 @@ def main() -> None:
     }
 
     # Generate and output results
-    output = generate_output(org_files, all_org_ids, tag_files, enable_features, args.directories)
-    print(output)
+    sys.stdout.writelines(_iter_report(
+        org_files, len(seen_once) + len(duplicates), duplicates, tag_files, enable_features, args.directories
+    ))
 
 
 if __name__ == '__main__':
@@ -1,20 +1,31 @@
 """Test suite for org-linter."""
 
+import os
 import pytest
 import tempfile
+from contextlib import contextmanager
 from pathlib import Path
 from unittest.mock import patch
 import sys
+import sqlite3
+import multiprocessing
 from io import StringIO
 
-# Import the org-linter module
-sys.path.insert(0, str(Path(__file__).parent.parent))
+# Import the org-linter module; its file name is not a valid module name, so load it by path
+# and register it, which lets later imports and pickling find it as org_linter
 import importlib.util
-spec = importlib.util.spec_from_file_location("org_linter", "/Users/dmg/git.dmg/org-roam-linter/org-linter.py")
+spec = importlib.util.spec_from_file_location("org_linter", Path(__file__).parent.parent / "org-linter.py")
 org_linter = importlib.util.module_from_spec(spec)
+sys.modules["org_linter"] = org_linter
 spec.loader.exec_module(org_linter)
 
 
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path, monkeypatch):
+    """Keep the parse cache of main() runs out of the user's home directory."""
+    monkeypatch.setattr(org_linter, 'DEFAULT_CACHE_DIR', tmp_path / "cache")
+
+
 @pytest.fixture
 def temp_dir():
     """Create a temporary directory for test files."""
@@ -152,6 +163,60 @@ def test_parse_arguments_multiple_directories():
         assert args.directories[1] == Path('/var')
 
 
+def test_parse_arguments_jobs():
+    """Test --jobs option parsing."""
+    with patch.object(sys, 'argv', ['org-linter', '--jobs', '3', '/tmp']):
+        args = org_linter.parse_arguments()
+        assert args.jobs == 3
+
+
+def test_parse_arguments_jobs_must_be_positive():
+    """Test that --jobs rejects counts below one."""
+    with patch.object(sys, 'argv', ['org-linter', '--jobs', '0', '/tmp']):
+        with pytest.raises(SystemExit):
+            org_linter.parse_arguments()
+
+
+def test_parse_arguments_cache_defaults():
+    """Test that the parse cache is enabled in the default location."""
+    with patch.object(sys, 'argv', ['org-linter', '/tmp']):
+        args = org_linter.parse_arguments()
+        assert args.no_cache is False
+        assert args.cache_dir == org_linter.DEFAULT_CACHE_DIR
+
+
+def test_parse_arguments_cache_options():
+    """Test --cache-dir and --no-cache parsing."""
+    with patch.object(sys, 'argv', ['org-linter', '--cache-dir', '/tmp/cache', '--no-cache', '/tmp']):
+        args = org_linter.parse_arguments()
+        assert args.cache_dir == Path('/tmp/cache')
+        assert args.no_cache is True
+
+
+def test_parse_arguments_walk_jobs():
+    """Test --walk-jobs default and override."""
+    with patch.object(sys, 'argv', ['org-linter', '/tmp']):
+        assert org_linter.parse_arguments().walk_jobs == org_linter.DEFAULT_WALK_JOBS
+    with patch.object(sys, 'argv', ['org-linter', '--walk-jobs', '1', '/tmp']):
+        assert org_linter.parse_arguments().walk_jobs == 1
+
+
+def test_parse_arguments_strict():
+    """Test that --strict selects orgparse parsing."""
+    with patch.object(sys, 'argv', ['org-linter', '/tmp']):
+        assert org_linter.parse_arguments().strict is False
+    with patch.object(sys, 'argv', ['org-linter', '--strict', '/tmp']):
+        assert org_linter.parse_arguments().strict is True
+
+
+def test_parse_arguments_prefetch():
+    """Test that --prefetch is off by default."""
+    with patch.object(sys, 'argv', ['org-linter', '/tmp']):
+        assert org_linter.parse_arguments().prefetch is False
+    with patch.object(sys, 'argv', ['org-linter', '--prefetch', '/tmp']):
+        assert org_linter.parse_arguments().prefetch is True
+
+
 def test_parse_arguments_directory_required():
     """Test that at least one directory is required."""
     with patch.object(sys, 'argv', ['org-linter']):
@@ -196,6 +261,40 @@ def test_find_org_files_recursive(temp_dir):
     assert any(f.name == "nested.org" for f in files)
 
 
+def test_find_org_files_sibling_subdirectories_without_entry_inodes(temp_dir, monkeypatch):
+    """Test that sibling subdirectories are all walked when DirEntry.stat() has no inode, as on Windows."""
+    for name in ["a", "b", "c"]:
+        (temp_dir / name).mkdir()
+        (temp_dir / name / f"{name}.org").write_text("#+TITLE: Note\n")
+
+    class WindowsLikeEntry:
+        """A directory entry whose stat() reports zero device and inode numbers."""
+        def __init__(self, entry):
+            self._entry = entry
+            self.name, self.path = entry.name, entry.path
+
+        def is_file(self):
+            return self._entry.is_file()
+
+        def is_dir(self):
+            return self._entry.is_dir()
+
+        def stat(self):
+            return os.stat_result((self._entry.stat().st_mode,) + (0,) * 9)
+
+    real_scandir = os.scandir
+
+    @contextmanager
+    def windows_like_scandir(directory):
+        with real_scandir(directory) as entries:
+            yield map(WindowsLikeEntry, entries)
+
+    with monkeypatch.context() as m:
+        m.setattr(os, 'scandir', windows_like_scandir)
+        files = org_linter.find_org_files([temp_dir], jobs=1)
+    assert [f.name for f in files] == ["a.org", "b.org", "c.org"]
+
+
 def test_find_org_files_ignores_non_org(temp_dir):
     """Test that non-.org files are ignored."""
     (temp_dir / "file.txt").write_text("Not an org file")
@@ -248,6 +347,34 @@ def test_find_org_files_avoids_symlink_cycles(temp_dir):
     assert any(f.name == "file.org" for f in files)
 
 
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_find_org_files_avoids_mutual_symlink_cycles(temp_dir, jobs):
+    """Test that directories linking to each other are each scanned once."""
+    dir_a = temp_dir / "dir_a"
+    dir_b = temp_dir / "dir_b"
+    dir_a.mkdir()
+    dir_b.mkdir()
+    (dir_a / "a.org").write_text("#+TITLE: A\n")
+    (dir_b / "b.org").write_text("#+TITLE: B\n")
+    (dir_a / "to_b").symlink_to(dir_b)
+    (dir_b / "to_a").symlink_to(dir_a)
+
+    files = org_linter.find_org_files([dir_a], jobs=jobs)
+    assert files == [dir_a / "a.org", dir_a / "to_b" / "b.org"]
+
+
+def test_find_org_files_scans_shared_directory_once(temp_dir):
+    """Test that a directory reached through several symlinks is scanned only once."""
+    shared = temp_dir / "shared"
+    shared.mkdir()
+    (shared / "file.org").write_text("#+TITLE: File\n")
+    (temp_dir / "link1").symlink_to(shared)
+    (temp_dir / "link2").symlink_to(shared)
+
+    files = org_linter.find_org_files([temp_dir], jobs=1)
+    assert [f.name for f in files] == ["file.org"]
+
+
 def test_find_org_files_symlink_to_file(temp_dir):
     """Test that symlinks to individual files are followed."""
     # Create a real org file
@@ -265,8 +392,45 @@ def test_find_org_files_symlink_to_file(temp_dir):
     assert any(f.name == "real.org" for f in files)
 
 
+def test_find_org_files_serial_and_threaded_agree(temp_dir):
+    """Test that walking in one thread finds the same files, under the same paths, as the thread pool."""
+    for name in ["a", "b", "a/c", "b/d/e", "f/g/target"]:
+        (temp_dir / name).mkdir(parents=True)
+        (temp_dir / name / "note.org").write_text("#+TITLE: Note\n")
+    (temp_dir / "b" / "link").symlink_to(temp_dir / "a")
+    # target is reachable at two depths; the slow listing of the shallow one must not change which wins
+    (temp_dir / "h").mkdir()
+    (temp_dir / "h" / "link").symlink_to(temp_dir / "f" / "g" / "target")
+    for i in range(400):
+        (temp_dir / "h" / f"filler{i}.txt").write_text("")
+
+    serial = org_linter.find_org_files([temp_dir], jobs=1)
+    assert len(serial) == 5
+    for _ in range(20):
+        assert org_linter.find_org_files([temp_dir], jobs=4) == serial
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_iter_org_files_yields_before_walk_ends(temp_dir, jobs):
+    """Test that files are yielded while deeper directories are still to be walked."""
+    (temp_dir / "top.org").write_text("#+TITLE: Top\n")
+    (temp_dir / "a" / "b").mkdir(parents=True)
+    (temp_dir / "a" / "b" / "deep.org").write_text("#+TITLE: Deep\n")
+
+    files = org_linter.iter_org_files([temp_dir], jobs=jobs)
+    assert next(files) == temp_dir / "top.org"
+    assert list(files) == [temp_dir / "a" / "b" / "deep.org"]
+
+
 # Org File Parsing Tests
 
+def test_traverse_nodes_document_order():
+    """Test that nodes are visited in document (preorder) order."""
+    root = org_linter.orgparse.loads("* A\n** A1\n*** A1a\n** A2\n* B\n** B1\n")
+    headings = [node.heading for node in org_linter._traverse_nodes(root)]
+    assert headings == ['', 'A', 'A1', 'A1a', 'A2', 'B', 'B1']
+
+
 def test_parse_org_file_with_id(sample_org_file_with_id):
     """Test extracting org-ids from a file."""
     org_ids, tags = org_linter.parse_org_file(sample_org_file_with_id)
@@ -289,85 +453,144 @@ def test_parse_org_file_byte_offset(sample_org_file_with_id):
     assert org_ids['id-12345'][0][1] == sample_org_file_with_id  # filepath should match
 
 
-def test_parse_org_file_no_ids():
+def test_parse_org_file_no_ids(temp_dir):
     """Test parsing file without org-ids."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.org', delete=False) as f:
-        f.write("#+TITLE: No IDs\n\n* Heading\nContent\n")
-        f.flush()
-        filepath = Path(f.name)
+    filepath = temp_dir / "test.org"
+    filepath.write_text("#+TITLE: No IDs\n\n* Heading\nContent\n")
 
-    try:
-        org_ids, tags = org_linter.parse_org_file(filepath)
-        assert len(org_ids) == 0
-    finally:
-        filepath.unlink()
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert len(org_ids) == 0
 
 
-def test_parse_org_file_no_tags():
+def test_parse_org_file_no_tags(temp_dir):
     """Test parsing file without tags."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.org', delete=False) as f:
-        f.write("#+TITLE: No Tags\n\n* Heading\nContent\n")
-        f.flush()
-        filepath = Path(f.name)
+    filepath = temp_dir / "test.org"
+    filepath.write_text("#+TITLE: No Tags\n\n* Heading\nContent\n")
 
-    try:
-        org_ids, tags = org_linter.parse_org_file(filepath)
-        assert len(tags) == 0
-    finally:
-        filepath.unlink()
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert len(tags) == 0
 
 
-def test_parse_org_file_with_file_level_id():
+def test_parse_org_file_with_file_level_id(temp_dir):
     """Test extracting file-level ID (#+ID:)."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.org', delete=False) as f:
-        f.write("#+ID: file-level-id\n#+TITLE: Test File\n\n* Heading\nContent\n")
-        f.flush()
-        filepath = Path(f.name)
+    filepath = temp_dir / "test.org"
+    filepath.write_text("#+ID: file-level-id\n#+TITLE: Test File\n\n* Heading\nContent\n")
 
-    try:
-        org_ids, tags = org_linter.parse_org_file(filepath)
-        assert 'file-level-id' in org_ids
-        assert len(org_ids['file-level-id']) == 1
-        assert org_ids['file-level-id'][0][1] == filepath
-    finally:
-        filepath.unlink()
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert 'file-level-id' in org_ids
+    assert len(org_ids['file-level-id']) == 1
+    assert org_ids['file-level-id'][0][1] == filepath
 
 
-def test_parse_org_file_with_file_and_heading_ids():
+def test_parse_org_file_with_file_and_heading_ids(temp_dir):
     """Test extracting both file-level and heading IDs."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.org', delete=False) as f:
-        f.write("#+ID: file-id\n#+TITLE: Test\n\n* Heading\n:PROPERTIES:\n:ID: heading-id\n:END:\n\nContent\n")
-        f.flush()
-        filepath = Path(f.name)
+    filepath = temp_dir / "test.org"
+    filepath.write_text("#+ID: file-id\n#+TITLE: Test\n\n* Heading\n:PROPERTIES:\n:ID: heading-id\n:END:\n\nContent\n")
 
-    try:
-        org_ids, tags = org_linter.parse_org_file(filepath)
-        assert 'file-id' in org_ids
-        assert 'heading-id' in org_ids
-        assert len(org_ids['file-id']) == 1
-        assert len(org_ids['heading-id']) == 1
-    finally:
-        filepath.unlink()
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert 'file-id' in org_ids
+    assert 'heading-id' in org_ids
+    assert len(org_ids['file-id']) == 1
+    assert len(org_ids['heading-id']) == 1
 
 
-def test_file_level_id_byte_offset():
+def test_file_level_id_byte_offset(temp_dir):
     """Test that file-level ID byte offset is correctly recorded."""
-    with tempfile.NamedTemporaryFile(mode='w', suffix='.org', delete=False) as f:
-        f.write("#+ID: test-file-id\n#+TITLE: Test\n\nContent\n")
-        f.flush()
-        filepath = Path(f.name)
+    filepath = temp_dir / "test.org"
+    filepath.write_text("#+ID: test-file-id\n#+TITLE: Test\n\nContent\n")
+
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert 'test-file-id' in org_ids
+    byte_offset = org_ids['test-file-id'][0][0]
+    assert byte_offset >= 0
+    # Verify it's at the beginning of the file
+    with open(filepath, 'r') as f:
+        content = f.read()
+        assert '#+ID: test-file-id' in content[byte_offset:byte_offset + 50]
+
+
+def test_parse_org_file_with_invalid_utf8(temp_dir):
+    """Test that undecodable bytes don't prevent extraction."""
+    filepath = temp_dir / "latin1.org"
+    filepath.write_bytes(b"* Caf\xe9 :food:\n:PROPERTIES:\n:ID: cafe-id\n:END:\n")
+
+    org_ids, tags = org_linter.parse_org_file(filepath)
+    assert org_ids['cafe-id'] == [(0, filepath)]
+    assert 'food' in tags
 
-    try:
-        org_ids, tags = org_linter.parse_org_file(filepath)
-        assert 'test-file-id' in org_ids
-        byte_offset = org_ids['test-file-id'][0][0]
-        assert byte_offset >= 0
-        # Verify it's at the beginning of the file
-        with open(filepath, 'r') as f:
-            content = f.read()
-            assert '#+ID: test-file-id' in content[byte_offset:byte_offset + 50]
-    finally:
-        filepath.unlink()
+
+def test_parse_org_file_skips_unneeded_extraction(temp_dir):
+    """Test that IDs or tags are left out when the caller doesn't need them."""
+    filepath = temp_dir / "file.org"
+    filepath.write_text("* H :tag:\n:PROPERTIES:\n:ID: some-id\n:END:\n")
+
+    org_ids, tags = org_linter.parse_org_file(filepath, need_tags=False)
+    assert 'some-id' in org_ids
+    assert tags == set()
+
+    org_ids, tags = org_linter.parse_org_file(filepath, need_ids=False)
+    assert org_ids == {}
+    assert tags == {'tag'}
+
+    assert org_linter.parse_org_file(filepath, need_ids=False, need_tags=False) == ({}, set())
+
+
+def test_read_file_ignores_rejected_fadvise(temp_dir, monkeypatch):
+    """Test that files are still read when the filesystem rejects read-ahead hints."""
+    def reject(fd, offset, length, advice):
+        raise OSError("fadvise not supported")
+
+    monkeypatch.setattr(org_linter, '_HAS_FADVISE', True)
+    monkeypatch.setattr(org_linter.os, 'posix_fadvise', reject, raising=False)
+    monkeypatch.setattr(org_linter.os, 'POSIX_FADV_SEQUENTIAL', 2, raising=False)
+    monkeypatch.setattr(org_linter.os, 'POSIX_FADV_WILLNEED', 3, raising=False)
+    filepath = temp_dir / "file.org"
+    filepath.write_bytes(b"* H\n")
+
+    assert org_linter._read_file(filepath) == b"* H\n"
+
+
+def test_parse_org_file_byte_offset_counts_raw_bytes(temp_dir):
+    """Test that heading offsets count bytes, including multi-byte and undecodable ones."""
+    prefix = "#+TITLE: Ünïcødé\n".encode('utf-8') + b"Caf\xe9\n\n"
+    filepath = temp_dir / "offsets.org"
+    filepath.write_bytes(prefix + b"* H\n:PROPERTIES:\n:ID: offset-id\n:END:\n")
+
+    org_ids, _ = org_linter.parse_org_file(filepath)
+    assert org_ids['offset-id'][0][0] == len(prefix)
+
+
+def test_parse_org_file_offsets_ignore_other_line_breaks(temp_dir):
+    """Test that characters str.splitlines treats as line breaks don't shift heading offsets."""
+    prefix = "Page one\x0cPage two\u2028still line two\n\n".encode('utf-8')
+    filepath = temp_dir / "breaks.org"
+    filepath.write_bytes(prefix + b"* H\n:PROPERTIES:\n:ID: break-id\n:END:\n")
+
+    org_ids, _ = org_linter.parse_org_file(filepath)
+    assert org_ids['break-id'][0][0] == len(prefix)
+
+
+@pytest.mark.parametrize("content", [
+    b"#+id: file-id\n#+FILETAGS: :ft1: ft2 :\n* H :a:b:\n:PROPERTIES:\n:ID: first\n:ID:  second  \n:END:\n",
+    b":PROPERTIES:\n:ID: root-id\n:END:\n* H\nText\n:PROPERTIES:\n:ID: late-id\n:END:\n:PROPERTIES:\n:ID: ignored\n:END:\n",
+    b"* No drawer :x:\n:ID: not-in-drawer\n*bold* :y:\n* Caf\xe9 :\xc3\xa9t\xc3\xa9:\n:PROPERTIES:\n:ID: a b :END:\n",
+    b"* H :t:\r\n:PROPERTIES:\r\n:ID: crlf-id\r\n:END:\r\n** Unclosed\n:PROPERTIES:\n:ID: open-id\n",
+    b"#+ID: one\n#+ID: two\n* H\n",
+    b"x #+ID: not-keyword\n  #+Id: indented-id\n#+ FILETAGS: :no:\n**\n*bold*\n*** :only:\n",
+    b"Prose without headings :x:\n:PROPERTIES:\n  :ID: kept\n x :ID: not-property\n",
+    b"* Meeting: notes: and more: stuff\n* a:b: c:d:\n* x::y::\n* Glued:tag:\n* t: :x:  \n",
+    "* Nbsp :a:\u00a0\n* Sep :b:\x1c\n* Wide :c:\u3000\n* Trailing :d:\u00e9\n".encode('utf-8'),
+    b":PROPERTIES:\n:CREATED: x\n:END:\n#+id: root-kw\n* A\n:PROPERTIES:\n:Id: mixed\n:id: lower\n:END:\n",
+    "\u00a0#+ID: nbsp-kw\n\u3000#+FILETAGS: :wide:\n* H\n:PROPERTIES:\n\u00a0:ID: nbsp-drawer\n:END:\n".encode('utf-8'),
+    "\x1c#+ID: sep-kw\n* H\n:PROPERTIES:\n\u2028\u0085:ID: break-drawer\n:END:\n".encode('utf-8'),
+    b"\xff\t#+ID: undecodable-kw\n* H\n:PROPERTIES:\nx\xc2\xa0:ID: not-blank\n:END:\n",
+])
+def test_parse_org_file_fast_scanner_matches_orgparse(temp_dir, content):
+    """Test that the default byte scanner extracts exactly what orgparse does."""
+    filepath = temp_dir / "file.org"
+    filepath.write_bytes(content)
+
+    assert org_linter.parse_org_file(filepath) == org_linter.parse_org_file(filepath, strict=True)
 
 
 def test_duplicate_file_and_heading_ids():
@@ -480,6 +703,152 @@ def test_no_duplicates_returns_empty(temp_dir):
     assert 'unique1' in all_org_ids
 
 
+def test_collect_org_ids_keeps_single_ids_apart(temp_dir):
+    """Test that IDs found once are kept as bare locations, apart from repeated IDs."""
+    file1 = temp_dir / "file1.org"
+    file2 = temp_dir / "file2.org"
+    file1.write_text("* H\n:PROPERTIES:\n:ID: dup\n:END:\n")
+    file2.write_text("#+ID: dup\n* H\n:PROPERTIES:\n:ID: unique\n:END:\n")
+
+    seen_once, duplicates, _ = org_linter._collect_org_ids(
+        [file1, file2], None, None, need_ids=True, need_tags=False, strict=False, prefetch=False
+    )
+    assert seen_once == {'unique': (10, file2)}
+    assert duplicates == {'dup': [(0, file1), (0, file2)]}
+
+
+@pytest.mark.skipif(multiprocessing.get_start_method() != 'fork',
+                    reason="worker processes must inherit the test-loaded module")
+def test_aggregate_org_ids_parallel_matches_serial(temp_dir, monkeypatch):
+    """Test that parsing in a process pool gives the same result as parsing serially."""
+    files = []
+    for i in range(6):
+        filepath = temp_dir / f"file{i}.org"
+        filepath.write_text(f"* H :tag{i % 2}:\n:PROPERTIES:\n:ID: id{i % 3}\n:END:\n")
+        files.append(filepath)
+
+    serial = org_linter.aggregate_org_ids(files, jobs=1)
+
+    monkeypatch.setattr(org_linter, 'PARALLEL_MIN_FILES', 1)
+    parallel = org_linter.aggregate_org_ids(files, jobs=2)
+
+    assert parallel == serial
+    # Locations share the caller's Path objects rather than copies from the workers
+    shared_paths = {id(filepath) for filepath in files}
+    assert all(id(filepath) in shared_paths
+               for locations in parallel[0].values() for _, filepath in locations)
+
+
+def test_aggregate_org_ids_keeps_location_order(temp_dir):
+    """Test that single and repeated IDs both list their locations in file order."""
+    files = []
+    for name in ("a.org", "b.org", "c.org"):
+        filepath = temp_dir / name
+        filepath.write_text(f"* H\n:PROPERTIES:\n:ID: shared\n:END:\n* {name}\n:PROPERTIES:\n:ID: {name}\n:END:\n")
+        files.append(filepath)
+
+    all_org_ids, _ = org_linter.aggregate_org_ids(files)
+    assert all_org_ids['shared'] == [(0, filepath) for filepath in files]
+    assert all_org_ids['b.org'] == [(35, files[1])]
+    assert len(all_org_ids) == 4
+
+
+def test_aggregate_org_ids_prefetch_matches_plain(temp_dir):
+    """Test that prefetching files doesn't change what is extracted."""
+    files = []
+    for i in range(5):
+        filepath = temp_dir / f"file{i}.org"
+        filepath.write_text(f"* H :tag{i}:\n:PROPERTIES:\n:ID: id-{i % 2}\n:END:\n")
+        files.append(filepath)
+    files.append(temp_dir / "missing.org")
+
+    assert org_linter.aggregate_org_ids(files, prefetch=True) == org_linter.aggregate_org_ids(files)
+
+
+def test_aggregate_org_ids_cache_reuses_unchanged_files(temp_dir, sqlsql_org_file):
+    """Test that a second run over unchanged files is served from the parse cache."""
+    cache = org_linter.open_parse_cache(temp_dir / "cache")
+    try:
+        first = org_linter.aggregate_org_ids([sqlsql_org_file], cache=cache)
+        with patch.object(org_linter, '_extract_from_file', side_effect=AssertionError("file was re-parsed")):
+            second = org_linter.aggregate_org_ids([sqlsql_org_file], cache=cache)
+    finally:
+        cache.close()
+
+    assert second == first
+    assert second[0]['sql-sql-20250501-204734'][0][1] == sqlsql_org_file
+
+
+def test_aggregate_org_ids_cache_reparses_changed_files(temp_dir):
+    """Test that the parse cache is bypassed once a file changes."""
+    filepath = temp_dir / "file.org"
+    filepath.write_text("* H\n:PROPERTIES:\n:ID: old-id\n:END:\n")
+
+    cache = org_linter.open_parse_cache(temp_dir / "cache")
+    try:
+        org_linter.aggregate_org_ids([filepath], cache=cache)
+        filepath.write_text("* H :tag:\n:PROPERTIES:\n:ID: new-id\n:END:\n")
+        all_org_ids, tag_files = org_linter.aggregate_org_ids([filepath], cache=cache)
+    finally:
+        cache.close()
+
+    assert 'new-id' in all_org_ids
+    assert 'old-id' not in all_org_ids
+    assert 'tag' in tag_files
+
+
+def test_aggregate_org_ids_cache_keeps_parse_variants_apart(temp_dir):
+    """Test that a result cached without tags is not reused when tags are needed."""
+    filepath = temp_dir / "file.org"
+    filepath.write_text("* H :tag:\n:PROPERTIES:\n:ID: some-id\n:END:\n")
+
+    cache = org_linter.open_parse_cache(temp_dir / "cache")
+    try:
+        _, tag_files = org_linter.aggregate_org_ids([filepath], cache=cache, need_tags=False)
+        assert tag_files == {}
+        all_org_ids, tag_files = org_linter.aggregate_org_ids([filepath], cache=cache)
+    finally:
+        cache.close()
+
+    assert 'some-id' in all_org_ids
+    assert 'tag' in tag_files
+
+
+def test_aggregate_org_ids_cache_locked_by_another_run(temp_dir, monkeypatch, caplog):
+    """Test that a cache another run holds locked is skipped with a warning instead of failing."""
+    filepath = temp_dir / "file.org"
+    filepath.write_text("* H\n:PROPERTIES:\n:ID: some-id\n:END:\n")
+
+    monkeypatch.setattr(org_linter, 'CACHE_BUSY_TIMEOUT', 0)
+    cache = org_linter.open_parse_cache(temp_dir / "cache")
+    other = sqlite3.connect(str(temp_dir / "cache" / org_linter.CACHE_FILENAME), timeout=0)
+    try:
+        other.execute('BEGIN IMMEDIATE')
+        all_org_ids, _ = org_linter.aggregate_org_ids([filepath], cache=cache)
+    finally:
+        other.close()
+        cache.close()
+
+    assert 'some-id' in all_org_ids
+    assert "Parse cache not updated" in caplog.text
+
+
+def test_aggregate_org_ids_unreadable_cache_parses_all_files(temp_dir, caplog):
+    """Test that files are still parsed when the cache can't be read."""
+    filepath = temp_dir / "file.org"
+    filepath.write_text("* H\n:PROPERTIES:\n:ID: some-id\n:END:\n")
+
+    cache = org_linter.open_parse_cache(temp_dir / "cache")
+    try:
+        cache.execute('DROP TABLE parsed')
+        all_org_ids, _ = org_linter.aggregate_org_ids([filepath], cache=cache)
+    finally:
+        cache.close()
+
+    assert 'some-id' in all_org_ids
+    assert "Parse cache unavailable" in caplog.text
+
+
 # Tags Summary Tests
 
 def test_tags_summary_single_file(sample_org_file_with_tags):
@@ -490,6 +859,18 @@ def test_tags_summary_single_file(sample_org_file_with_tags):
     assert 'tag3' in tag_files
 
 
+def test_tags_summary_lists_each_file_once(temp_dir):
+    """Test that a tag on several headings of a file lists that file once."""
+    file1 = temp_dir / "file1.org"
+    file2 = temp_dir / "file2.org"
+    file1.write_text("#+FILETAGS: :shared:\n* H1 :shared:\n* H2 :shared:other:\n")
+    file2.write_text("* H :shared:\n")
+
+    _, tag_files = org_linter.aggregate_org_ids([file1, file2])
+    assert tag_files['shared'] == [file1, file2]
+    assert tag_files['other'] == [file1]
+
+
 def test_tags_summary_multiple_files(temp_dir):
     """Test tags summary across multiple files."""
     file1 = temp_dir / "file1.org"
@@ -547,6 +928,38 @@ def test_format_org_table_spacing():
     assert all(line.startswith('|') and line.endswith('|') for line in lines if line)
 
 
+def test_format_org_table_non_string_cells():
+    """Test that non-string cells are converted and columns padded to the widest cell."""
+    table = org_linter.format_org_table(['n', 'name'], [[5, 'a'], [1000, 'bb']])
+    lines = table.split('\n')
+    assert lines[1] == '| n    | name |'
+    assert lines[3] == '| 5    | a    |'
+    assert lines[4] == '| 1000 | bb   |'
+    assert len({len(line) for line in lines[1:-1] if not line.startswith('| -')}) == 1
+
+
+def test_format_org_table_pads_short_rows():
+    """Test that rows with fewer cells than headers are padded with empty cells."""
+    table = org_linter.format_org_table(['a', 'bb', 'c'], [['x'], ['longer', 'y']])
+    lines = table.split('\n')
+    assert lines[3] == '| x      |    |   |'
+    assert lines[4] == '| longer | y  |   |'
+
+
+def test_format_org_table_rejects_long_rows():
+    """Test that a row with more cells than headers is an error instead of being cut short."""
+    with pytest.raises(ValueError):
+        org_linter.format_org_table(['a'], [['x', 'extra']])
+
+
+def test_format_org_table_keeps_braces_in_cells():
+    """Test that braces in cell values are copied literally."""
+    table = org_linter.format_org_table(['id'], [['{0}'], ['{x:>9}']])
+    lines = table.split('\n')
+    assert lines[3] == '| {0}    |'
+    assert lines[4] == '| {x:>9} |'
+
+
 def test_get_timestamp():
     """Test timestamp generation."""
     ts = org_linter.get_timestamp()
@@ -660,6 +1073,19 @@ def test_generate_output_enabled_tags_summary(temp_dir):
     assert 'shared' in output
 
 
+def test_iter_output_streams_newline_terminated_chunks(duplicate_org_files):
+    """Test that the streamed output is made of whole lines and matches generate_output."""
+    all_org_ids, tag_files = org_linter.aggregate_org_ids(duplicate_org_files)
+    features = {'duplicate-ids': True, 'tags-summary': True}
+    with patch.object(org_linter, 'get_timestamp', return_value='2025-01-01 00:00:00'):
+        chunks = list(org_linter.iter_output(duplicate_org_files, all_org_ids, tag_files, features))
+        output = org_linter.generate_output(duplicate_org_files, all_org_ids, tag_files, features)
+
+    assert all(chunk.endswith('\n') for chunk in chunks)
+    assert ''.join(chunks) == output
+    assert '* Repeated IDs\n' in chunks
+
+
 # Integration Tests
 
 def test_main_integration_help():
@@ -673,7 +1099,7 @@ def test_main_integration_help():
 
 def test_main_integration_with_test_data():
     """Integration test with test-data directory."""
-    test_data_path = Path('/Users/dmg/git.dmg/org-roam-linter/test-data')
+    test_data_path = Path(__file__).parent.parent / 'test-data'
     if test_data_path.exists():
         org_files = org_linter.find_org_files([test_data_path])
         assert len(org_files) > 0, "test-data should contain org files"
@@ -736,6 +1162,20 @@ def test_duplicate_ids_sorted_lexicographically(temp_dir):
         assert a_pos < z_pos
 
 
+def test_duplicate_ids_relative_display_paths():
+    """Test that display paths are relative to the first base directory that contains them."""
+    all_org_ids = {'dup': [
+        (0, Path('/notes/sub/a.org')),
+        (1, Path('/notes-extra/b.org')),
+        (2, Path('rel/c.org')),
+    ]}
+    section = org_linter.generate_duplicate_ids_section(all_org_ids, [Path('/notes'), Path('.')])
+    assert '[sub/a.org::0]' in section
+    # A sibling directory sharing the name prefix is not under /notes
+    assert '[b.org::1]' in section
+    assert '[rel/c.org::2]' in section
+
+
 def test_duplicate_ids_symlink_subpath_display(temp_dir):
     """Test that symlink subpaths are displayed correctly in duplicate IDs report."""
     # Create a real directory with nested org files
@@ -1047,3 +1487,50 @@ def test_main_with_multiple_base_dirs_and_ignore(temp_dir):
             # Should show 2 unique IDs (id1 and id3, not id2)
             assert 'IDs found: 2' in output
             assert 'Duplicate IDs: 0' in output
+
+
+@pytest.fixture
+def report_org_files(temp_dir):
+    """Create org files with a repeated ID, a single ID and a tag shared by two files."""
+    (temp_dir / "sub").mkdir()
+    (temp_dir / "a.org").write_text("#+FILETAGS: :shared:\n* A :solo:\n:PROPERTIES:\n:ID: dup-id\n:END:\n")
+    (temp_dir / "sub" / "b.org").write_text(
+        "* B :shared:\n:PROPERTIES:\n:ID: dup-id\n:END:\n* C\n:PROPERTIES:\n:ID: only-id\n:END:\n"
+    )
+    return temp_dir
+
+
+def _run_main(argv):
+    """Run main() with the given arguments and a fixed timestamp, returning what it printed."""
+    with patch.object(sys, 'argv', ['org-linter'] + argv), \
+            patch.object(org_linter, 'get_timestamp', return_value='2025-01-01 00:00:00'), \
+            patch('sys.stdout', new=StringIO()) as fake_out:
+        org_linter.main()
+    return fake_out.getvalue()
+
+
+def test_main_reports_duplicates_and_tags(report_org_files):
+    """Test the report main() prints with both sections enabled."""
+    output = _run_main(['--enable-duplicate-ids', '--enable-tags-summary', str(report_org_files)])
+
+    assert 'Files scanned: 2\nIDs found: 2\nDuplicate IDs: 1\n' in output
+    a_file = report_org_files / "a.org"
+    b_file = report_org_files / "sub" / "b.org"
+    assert f'| dup-id | 2         | 2             | [[file:{a_file}::21][a.org::21]], [[file:{b_file}::0][sub/b.org::0]] |' in output
+    assert '| shared | 2         |' in output
+    assert 'solo' not in output
+    assert 'only-id' not in output
+
+
+def test_main_report_matches_public_api(report_org_files):
+    """Test that main() prints the same report as find_org_files, aggregate_org_ids and generate_output."""
+    output = _run_main(['--enable-duplicate-ids', '--enable-tags-summary', str(report_org_files)])
+
+    org_files = org_linter.find_org_files([report_org_files])
+    all_org_ids, tag_files = org_linter.aggregate_org_ids(org_files)
+    with patch.object(org_linter, 'get_timestamp', return_value='2025-01-01 00:00:00'):
+        expected = org_linter.generate_output(
+            org_files, all_org_ids, tag_files,
+            {'duplicate-ids': True, 'tags-summary': True}, [report_org_files]
+        )
+    assert output == expected